@@ -37,9 +37,6 @@ Example:
 Todo::
 	* Finish implementing *QToolTip*, currently having issues and can't
 	get it to display properly.
-	* Finish implementing the horizontal QScrollBar instance so I can cover
-	both horizontal and vertical states since the stylesheets allow using
-	those as selectors for applying different styles.
 """
 
 
@@ -58,10 +55,13 @@ __version__ = "0.9.3"
 #	to see new C++ features bubble to the surface in python.
 from PySide2.QtWidgets import *
 from PySide2.QtCore import *
+from PySide2.QtGui import QPainter
 
 # Standard Library Imports
-#from threading import Thread, Event
-import sys, io
+from threading import Thread, Event, Lock, main_thread
+from time import monotonic, perf_counter
+from math import isfinite
+import sys, io, traceback
 
 
 _qt_supported_html_subset = """
@@ -153,6 +153,22 @@ class Error(Exception):
 	"""Generic base class error for this module."""
 	pass
 
+class RenderError(Error):
+	"""A preview's render couldn't be written to the render cache.
+
+	Args:
+		path (str): Where the render was supposed to be written.
+		message (str): Human readable string describing the exception.
+
+	Attributes:
+		path (str): Where the render was supposed to be written.
+		message (str): Human readable string describing the exception.
+	"""
+	def __init__(self, path, message):
+		Error.__init__(self, "%s `%s`" % (message, path))
+		self.path = path
+		self.message = message
+
 class CommandLineError(Error):
 	"""Any error occuring because the CLI was used improperly.
 
@@ -169,13 +185,228 @@ class CommandLineError(Error):
 		self.message = message
 
 
+class _TimedScrollBar(QScrollBar):
+	"""A QScrollBar which keeps track of how long it spends painting itself,
+	which is where a stylesheet's scroll bar rules actually cost us.
+
+	Attributes:
+		paint_time (float): Seconds spent painting since the last reset.
+		paint_count (int): Paint events handled since the last reset.
+	"""
+	def __init__(self, orientation):
+		QScrollBar.__init__(self, orientation)
+		self.paint_time = 0.0
+		self.paint_count = 0
+
+	def paintEvent(self, event):
+		start = perf_counter()
+		QScrollBar.paintEvent(self, event)
+		self.paint_time += perf_counter() - start
+		self.paint_count += 1
+
+class _ScrollCanvas(QWidget):
+	"""A large, stylable surface with a coordinate grid drawn on it so there's
+	something to scroll through in both directions.
+
+	Attributes:
+		paint_time (float): Seconds spent drawing the stylesheet's background
+			since the last reset, which is all the stylesheet is responsible
+			for here.
+		harness_time (float): Seconds spent drawing the grid since the last
+			reset. That's our own overhead, not the stylesheet's.
+		paint_count (int): Paint events handled since the last reset, which
+			is as close as Qt lets us get to a frame count.
+	"""
+	cell = 100
+	"""int: Width and height of a grid cell in pixels."""
+
+	def __init__(self, width=4000, height=4000):
+		QWidget.__init__(self)
+		self.setFixedSize(width, height)
+		self.paint_time = 0.0
+		self.harness_time = 0.0
+		self.paint_count = 0
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+
+		# Plain QWidget subclasses have to ask the style to draw their
+		# background themselves or stylesheet rules won't apply to them.
+		start = perf_counter()
+		option = QStyleOption()
+		option.initFrom(self)
+		self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+		background = perf_counter()
+
+		# Only draw the cells that were actually exposed.
+		area = event.rect()
+		left = area.left() - area.left() % self.cell
+		top = area.top() - area.top() % self.cell
+		for x in range(left, area.right() + 1, self.cell):
+			for y in range(top, area.bottom() + 1, self.cell):
+				painter.drawRect(x, y, self.cell, self.cell)
+				painter.drawText(x + 4, y + 16, "(%d, %d)" % (x, y))
+
+		painter.end()
+		self.paint_time += background - start
+		self.harness_time += perf_counter() - background
+		self.paint_count += 1
+
+
+class _StallWatchdog(Thread):
+	"""Watches a heartbeat sent from the GUI thread and records every time
+	the Qt event loop fails to deliver it on time.
+
+	The GUI thread must call `beat` from a `QTimer` every `interval` seconds.
+	When a beat is late by more than `threshold` seconds, this thread grabs
+	the main thread's Python stack via `sys._current_frames` so we can see
+	what was hogging the event loop, along with whatever activity was last
+	registered through `begin` and not yet finished with through `end`.
+
+	Args:
+		interval (float): The heartbeat period in seconds.
+		threshold (float): How late a heartbeat may be, in seconds, before
+			it counts as a stall.
+		logfile (str, optional): Path of a file stall reports are appended to.
+
+	Attributes:
+		stalls (list): Every finished stall as a dict with the keys
+			``activity``, ``stack`` and ``duration`` (in seconds).
+	"""
+	def __init__(self, interval, threshold, logfile=None):
+		Thread.__init__(self, name="stall_watchdog", daemon=True)
+		self.interval = interval
+		self.threshold = threshold
+		self.stalls = []
+
+		self._main_ident = main_thread().ident
+		self._lock = Lock()
+		self._log_lock = Lock()
+		self._halt = Event()
+		self._last_beat = monotonic()
+		self._activity = None
+		self._current = None
+		self._log = open(logfile, "a") if logfile else None
+
+	def _write(self, text):
+		# Kept apart from self._lock so the GUI thread is never left waiting
+		# on the disk when it just wants to register an activity.
+		with self._log_lock:
+			if self._log is not None:
+				self._log.write(text)
+				self._log.flush()
+
+	def begin(self, activity):
+		"""Name the reload or interaction the GUI thread is about to process.
+
+		Returns:
+			object: A token to hand to `end` once it's been processed.
+		"""
+		token = object()
+		with self._lock:
+			self._activity = (token, activity)
+
+		return token
+
+	def end(self, token):
+		"""Forget the activity `begin` returned `token` for, unless something
+		else has been started since."""
+		with self._lock:
+			if self._activity is not None and self._activity[0] is token:
+				self._activity = None
+
+	def beat(self):
+		"""Heartbeat, must be called from the GUI thread.
+
+		Returns:
+			dict: The stall that just ended, or None if there wasn't one.
+		"""
+		now = monotonic()
+		with self._lock:
+			stall = self._current
+			self._current = None
+			self._last_beat = now
+
+			if stall is not None:
+				stall["duration"] = now - stall["start"]
+				self.stalls.append(stall)
+
+		if stall is not None:
+			self._write("stall ended after %d ms\n\n" % (stall["duration"] * 1000))
+
+		return stall
+
+	def run(self):
+		poll = min(self.interval, self.threshold) / 2
+		while not self._halt.wait(poll):
+			with self._lock:
+				late = monotonic() - self._last_beat - self.interval
+				if self._current is not None or late <= self.threshold:
+					continue
+
+				# Only note where the main thread is while holding the lock.
+				# Looking up the source lines can mean reading from disk.
+				frame = sys._current_frames().get(self._main_ident)
+				frames = traceback.StackSummary.extract(
+					traceback.walk_stack(frame), lookup_lines=False
+				) if frame else []
+				stall = self._current = {
+					"activity": self._activity[1] if self._activity else "idle",
+					"stack": "",
+					"start": self._last_beat + self.interval,
+				}
+
+			frames.reverse()
+			stall["stack"] = "".join(traceback.format_list(frames))
+
+			# Write the stack now rather than when the stall ends, because
+			# if the preview hangs for good it never will.
+			self._write("stall detected during %s:\n%s" % (
+				stall["activity"], stall["stack"]))
+
+	def summary(self):
+		"""str: A one line, human readable account of the recorded stalls."""
+		with self._lock:
+			stalls = list(self.stalls)
+
+		if not stalls:
+			return "No event loop stalls recorded"
+
+		worst = max(stalls, key=lambda s: s["duration"])
+		return "%d event loop stall(s), %d ms total, worst %d ms during %s" % (
+			len(stalls),
+			sum(s["duration"] for s in stalls) * 1000,
+			worst["duration"] * 1000,
+			worst["activity"],
+		)
+
+	def stop(self):
+		"""Stop watching and append the summary to the log file."""
+		self._halt.set()
+		self.join(1)
+		self._write(self.summary() + "\n")
+		with self._log_lock:
+			if self._log is not None:
+				self._log.close()
+				self._log = None
+
+
 class PySide2StyleTestWidget(QMainWindow):
 	"""This Application's Qt User Interface. Displays all of QT-5's styleable
 	elements so modders can actively see their changes to their styles take
 	effect.
 
 	Args::
-		stylesheet (str): The path to the stylesheet you want to test.
+		stylesheet (str, optional): The path to the stylesheet you want to
+			test. Without it only a bare, unstyled window is made, whose
+			``_init_*_preview`` methods can then be used to build previews
+			on their own, the way ``--diff-against`` does.
+		watchdog (int, optional): Enables the event loop stall watchdog.
+			Any heartbeat arriving more than this many milliseconds late is
+			reported in the status bar along with the reload or interaction
+			that was being processed at the time.
+		watchdog_log (str, optional): File the watchdog appends the main
+			thread's stack to for every stall, plus a summary on exit.
 
 	Implemented Core Qt Elements (with Active States) Checklist::
 		 - [x] *QAbstractScrollArea*
@@ -222,6 +453,65 @@ class PySide2StyleTestWidget(QMainWindow):
 	#	for t in self._threads:
 	#		t.join(1)
 
+	_watchdog_heartbeat = 100
+	"""int: Milliseconds between the watchdog's GUI thread heartbeats."""
+
+	_watchdog_events = {
+		QEvent.MouseButtonPress: "mouse press",
+		QEvent.MouseButtonRelease: "mouse release",
+		QEvent.MouseButtonDblClick: "double click",
+		QEvent.KeyPress: "key press",
+		QEvent.Wheel: "wheel",
+	}
+	"""dict: User input events the watchdog names as interactions."""
+
+	def _watchdog_begin(self, activity):
+		if self._watchdog is None:
+			return
+
+		token = self._watchdog.begin(activity)
+
+		# Most of the work isn't done by whatever called us but by the events
+		# it posts, like the repolish, relayout and repaint queued up by
+		# setStyleSheet. Zero timeouts only fire after the posted events have
+		# been delivered, and the second one catches anything posted while
+		# delivering the first batch, such as the repaint a relayout asks for.
+		QTimer.singleShot(0, lambda: QTimer.singleShot(0,
+			lambda: self._watchdog.end(token)))
+
+	def _watchdog_beat(self):
+		stall = self._watchdog.beat()
+		if stall is not None:
+			self.statusBar().showMessage(
+				"Event loop stalled for %d ms during %s (%s)" % (
+					stall["duration"] * 1000,
+					stall["activity"],
+					self._watchdog.summary()
+				), 10000)
+
+	def eventFilter(self, watched, event):
+		# Installed on the application while the watchdog is running so we
+		# know which widget interaction was in flight when a stall happens.
+		action = self._watchdog_events.get(event.type())
+		if action is not None and watched.isWidgetType():
+			name = watched.objectName()
+			self._watchdog_begin("%s on %s%s" % (
+				action,
+				watched.metaObject().className(),
+				" #" + name if name else ""
+			))
+
+		return False
+
+	def closeEvent(self, event):
+		if self._watchdog is not None:
+			QApplication.instance().removeEventFilter(self)
+			self._watchdog_timer.stop()
+			self._watchdog.stop()
+			print(self._watchdog.summary())
+
+		QMainWindow.closeEvent(self, event)
+
 	def _init_QStatusBar_preview(self):
 		status = QStatusBar()
 
@@ -434,8 +724,26 @@ class PySide2StyleTestWidget(QMainWindow):
 
 	def _init_QScrollBar_preview(self):
 		# Since the style can influence both horizontal and vertical states
-		# differently we'll need to display one of each. This is Vertical.
-		pass
+		# differently we'll need to display one of each. Then a canvas that
+		# scrolls both ways so they're also seen attached to a scroll area.
+		scrolllayout = QGridLayout()
+
+		Hscroll = QScrollBar(Qt.Orientation.Horizontal)
+		Vscroll = QScrollBar(Qt.Orientation.Vertical)
+
+		canvas = QScrollArea()
+		canvas.setHorizontalScrollBar(_TimedScrollBar(Qt.Orientation.Horizontal))
+		canvas.setVerticalScrollBar(_TimedScrollBar(Qt.Orientation.Vertical))
+		canvas.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+		canvas.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+		canvas.setWidget(_ScrollCanvas())
+		canvas.setMinimumHeight(250)
+
+		scrolllayout.addWidget(canvas, 0, 0)
+		scrolllayout.addWidget(Vscroll, 0, 1)
+		scrolllayout.addWidget(Hscroll, 1, 0)
+
+		return scrolllayout
 
 	def _init_QToolBox_preview(self):
 		tools = QToolBox()
@@ -488,10 +796,112 @@ class PySide2StyleTestWidget(QMainWindow):
 
 		return richtext
 
-	def __init__(self, stylesheet):
+	def run_scroll_benchmark(self, duration=5.0, rate=60, step=16):
+		"""Scroll the QScrollBar preview's canvas diagonally at a fixed rate
+		and report how well the current stylesheet keeps up.
+
+		This returns immediately; the scrolling is driven by a timer on the
+		event loop and the results are printed and shown in the status bar
+		once `duration` has passed.
+
+		Args:
+			duration (float): How long to scroll for, in seconds.
+			rate (int): How many times per second to move the scroll bars,
+				from 1 to 1000. Qt's timers count in whole milliseconds, so
+				it's rounded to the nearest rate that fits; the report shows
+				the rate actually used.
+			step (int): How many pixels to move them each time.
+		"""
+		if not (duration > 0 and isfinite(duration)):
+			raise ValueError("scroll duration must be positive, not %r" % duration)
+		if not 1 <= rate <= 1000:
+			raise ValueError("scroll rate must be from 1 to 1000, not %r" % rate)
+
+		area = self._scroll_benchmark_area
+		canvas = area.widget()
+		bars = (area.horizontalScrollBar(), area.verticalScrollBar())
+
+		# Paint events are only delivered to what's on screen.
+		self.centralWidget().setCurrentWidget(self._basicview_scrollarea)
+		self._basicview_scrollarea.ensureWidgetVisible(area)
+
+		canvas.harness_time = 0.0
+		for each in (canvas,) + bars:
+			each.paint_time = 0.0
+			each.paint_count = 0
+		for bar in bars:
+			bar.setValue(bar.minimum())
+		directions = [1, 1]
+
+		timer = QTimer(self)
+		timer.setTimerType(Qt.TimerType.PreciseTimer)
+		start = perf_counter()
+
+		def tick():
+			elapsed = perf_counter() - start
+			if elapsed < duration:
+				self._watchdog_begin("scroll benchmark")
+				for i, bar in enumerate(bars):
+					# Bounce back and forth between the ends of each bar.
+					value = bar.value() + step * directions[i]
+					if not bar.minimum() <= value <= bar.maximum():
+						directions[i] = -directions[i]
+					bar.setValue(value)
+				return
+
+			timer.stop()
+			timer.deleteLater()
+
+			frames = canvas.paint_count
+			bar_frames = sum(bar.paint_count for bar in bars)
+			report = (
+				"Scroll benchmark: %.1f fps over %.1f s (target %.1f), "
+				"%.2f ms/frame canvas background, %.2f ms/paint scroll bars, "
+				"%.2f ms/frame grid harness" % (
+				frames / elapsed, elapsed, 1000 / timer.interval(),
+				canvas.paint_time * 1000 / frames if frames else 0,
+				sum(bar.paint_time for bar in bars) * 1000 / bar_frames
+					if bar_frames else 0,
+				canvas.harness_time * 1000 / frames if frames else 0
+			))
+			print(report)
+			self.statusBar().showMessage(report)
+
+		timer.timeout.connect(tick)
+		timer.start(round(1000 / rate))
+
+	def __init__(self, stylesheet=None, watchdog=None, watchdog_log=None):
 		"""Construct the GUI in memory."""
 		QMainWindow.__init__(self)
 
+		self._watchdog = None
+		if stylesheet is None:
+			if watchdog is not None:
+				raise ValueError("the watchdog needs a stylesheet to watch")
+			return
+
+		# Start the watchdog first so it can catch stalls in the initial
+		# stylesheet load at the bottom of this function.
+		if watchdog is not None:
+			if watchdog <= 0:
+				raise ValueError("watchdog threshold must be positive, not %r" % watchdog)
+
+			try:
+				self._watchdog = _StallWatchdog(
+					self._watchdog_heartbeat / 1000,
+					watchdog / 1000,
+					watchdog_log
+				)
+			except (OSError) as e:
+				print("%s `%s`" %(e.strerror, e.filename), file=sys.stderr)
+				sys.exit(e.errno)
+
+			self._watchdog_timer = QTimer(self)
+			self._watchdog_timer.timeout.connect(self._watchdog_beat)
+			self._watchdog_timer.start(self._watchdog_heartbeat)
+			QApplication.instance().installEventFilter(self)
+			self._watchdog.start()
+
 		# IOBase in python3 provides __del__ meta function by default
 		# upon variable destruction to close the file so we don't have to.
 		try:
@@ -502,6 +912,7 @@ class PySide2StyleTestWidget(QMainWindow):
 
 		def refresh_stylesheet():
 			print("refreshing stylesheet!")
+			self._watchdog_begin("stylesheet reload")
 			self._stylesheet.seek(0)
 			self.setStyleSheet(self._stylesheet.read())
 
@@ -532,6 +943,7 @@ class PySide2StyleTestWidget(QMainWindow):
 
 		# Configure our scroll area to scroll vertically and pass our container
 		basicview_scrollarea = QScrollArea() # Inherits QAbstractScrollArea
+		self._basicview_scrollarea = basicview_scrollarea
 		basicview_scrollarea.setWidget(scrollcontent)
 		# always have it visible so we can see how styling changes it.
 		basicview_scrollarea.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -554,6 +966,10 @@ class PySide2StyleTestWidget(QMainWindow):
 		basicview.addRow("QTableView", self._init_QTabelWidget_preview())
 		basicview.addRow("QToolBox", self._init_QToolBox_preview())
 		basicview.addRow("QToolTip", self._init_QToolTip_preview())
+		scrollbars = self._init_QScrollBar_preview()
+		basicview.addRow("QScrollBar", scrollbars)
+		# Kept around so run_scroll_benchmark knows what to scroll.
+		self._scroll_benchmark_area = scrollbars.itemAtPosition(0, 0).widget()
 		#basicview.addRow("QTreeView", self._init_QTreeView_preview())
 
 		# And finally, add our basic, and more complicated views into their
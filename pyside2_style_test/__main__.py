@@ -24,5 +24,7 @@
 
 from .cli import main
 
+import sys
 
-main()
+
+sys.exit(main())
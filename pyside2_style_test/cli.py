@@ -27,13 +27,79 @@ public scope just in case someone decides they want to do more with it.
 
 
 from . import PySide2StyleTestWidget as _PySide2StyleTestWidget
-from . import __version__, CommandLineError
+from . import __version__, CommandLineError, RenderError
+from .incremental import render_changed
 from PySide2.QtWidgets import QApplication
+from PySide2.QtCore import QTimer
 
 import argparse
+import math
 import sys
 
 
+def _positive_int(value):
+	"""Argument type for options that only make sense above zero."""
+	number = int(value)
+	if number <= 0:
+		raise argparse.ArgumentTypeError("must be greater than 0, not %s" % value)
+
+	return number
+
+
+def _positive_float(value):
+	"""Argument type for lengths of time, which have to be over zero and
+	actually end."""
+	number = float(value)
+	if not (number > 0 and math.isfinite(number)):
+		raise argparse.ArgumentTypeError("must be greater than 0, not %s" % value)
+
+	return number
+
+
+def _scroll_rate(value):
+	"""Argument type for --scroll-rate, Qt's timers can't tick any faster
+	than once a millisecond."""
+	rate = int(value)
+	if not 1 <= rate <= 1000:
+		raise argparse.ArgumentTypeError("must be from 1 to 1000, not %s" % value)
+
+	return rate
+
+
+def _diff(test_widget, arguments):
+	"""Run --diff-against, returning the exit status for it."""
+	# Only a bare window is needed for its preview builders. The whole
+	# catalog styled with the new stylesheet would be wasted work here.
+	try:
+		window = test_widget()
+	except (TypeError) as e:
+		print("--diff-against needs a test widget which can be made without "
+			"a stylesheet: %s" % e, file=sys.stderr)
+		return 2
+
+	# Every I/O failure gets the same status, so it can't be mistaken for
+	# the status saying a preview changed.
+	try:
+		with open(arguments.diff_against, "r") as old, \
+			open(arguments.file, "r") as new:
+			results = render_changed(
+				window, old.read(), new.read(), arguments.render_cache)
+	except (OSError) as e:
+		if e.filename is not None:
+			print("%s `%s`" %(e.strerror, e.filename), file=sys.stderr)
+		else:
+			print(e, file=sys.stderr)
+		return 2
+	except (RenderError) as e:
+		print(e, file=sys.stderr)
+		return 2
+
+	for name, status, path in results:
+		print("%-10s %-20s %s" % (status, name, path))
+
+	return 1 if any(status == "changed" for _, status, _ in results) else 0
+
+
 def main(*argv, test_widget=_PySide2StyleTestWidget):
 	"""The main application of this library. Made available as a function
 	for other scripts to extend it's function.
@@ -44,6 +110,14 @@ def main(*argv, test_widget=_PySide2StyleTestWidget):
 		test_widget (:obj:`QWidget`, optional): Any PySide2 compliant widget
 			that will be used as the main display window once the program is
 			initalized. By default this is an instance of `PySide2StyleTestWidget`.
+			It's made with the stylesheet's path, except for --diff-against,
+			which makes it with no arguments at all and expects a bare window
+			whose ``_init_*_preview`` methods can be used on their own.
+
+	Returns:
+		int: The exit status of a --diff-against run, which is 1 when any
+		preview looks different and 2 when anything couldn't be read or
+		written. Otherwise None, once the GUI has been closed.
 	"""
 	# NOTE:
 	# 	Even though this won't be using any alternative UIs I'm going to
@@ -67,12 +141,71 @@ def main(*argv, test_widget=_PySide2StyleTestWidget):
 		help="the stylesheet you want to test",
 		required=True,
 	)
+	parser.add_argument("--watchdog",
+		help="""report every time the GUI stops responding for longer than
+		this many milliseconds, along with what it was doing at the time""",
+		metavar="MS",
+		type=_positive_int,
+	)
+	parser.add_argument("--watchdog-log",
+		help="append the stack of every watchdog stall to this file",
+		metavar="FILE",
+	)
+	parser.add_argument("--scroll-benchmark",
+		help="""once the window is up, scroll the QScrollBar preview canvas
+		for this many seconds and report the frame rate and paint cost""",
+		metavar="SECONDS",
+		type=_positive_float,
+	)
+	parser.add_argument("--scroll-rate",
+		help="""how many times per second the scroll benchmark scrolls, from
+		1 to 1000 (default: 60). Rounded to a whole millisecond interval, the
+		report shows the rate actually used""",
+		metavar="HZ",
+		type=_scroll_rate,
+	)
+	parser.add_argument("--diff-against",
+		help="""instead of opening the preview, render each widget affected
+		by the changes since this older revision of the stylesheet and report
+		which of them look different. Exits with 1 if any do, and 2 if
+		anything couldn't be read or written. Set QT_QPA_PLATFORM=offscreen to run this
+		without a display""",
+		metavar="OLD",
+	)
+	parser.add_argument("--render-cache",
+		help="where --diff-against keeps the renders of each revision",
+		metavar="DIR",
+		default=".pyside2-style-test-cache",
+	)
 
 	arguments = parser.parse_args(qt_application.arguments()[1:])
 
-	GUI = test_widget(arguments.file)
+	if arguments.scroll_rate is not None and arguments.scroll_benchmark is None:
+		parser.error("--scroll-rate requires --scroll-benchmark")
+
+	# Only pass the watchdog options along when they're used so test widgets
+	# written for older versions of this script keep working.
+	options = {}
+	if arguments.watchdog is not None:
+		options["watchdog"] = arguments.watchdog
+		options["watchdog_log"] = arguments.watchdog_log
+	elif arguments.watchdog_log is not None:
+		parser.error("--watchdog-log requires --watchdog")
+
+	if arguments.diff_against is not None:
+		if arguments.watchdog is not None or arguments.scroll_benchmark is not None:
+			parser.error("--diff-against can't be combined with --watchdog "
+				"or --scroll-benchmark, it never opens the GUI")
+
+		return _diff(test_widget, arguments)
+
+	GUI = test_widget(arguments.file, **options)
 	GUI.show()
 
+	if arguments.scroll_benchmark is not None:
+		QTimer.singleShot(0, lambda: GUI.run_scroll_benchmark(
+			arguments.scroll_benchmark, arguments.scroll_rate or 60))
+
 	# Hand off control of signal processing to Qt. This function is
 	# blocking and only returns when the user exits from the GUI.
 	#
@@ -89,5 +222,4 @@ def main(*argv, test_widget=_PySide2StyleTestWidget):
 
 def _main():
 	"""Main function alias for command line setuptools script"""
-	main(sys.argv)
-	sys.exit()
+	sys.exit(main(sys.argv))
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2019 Ruby Allison Rose (aka: M3TIOR)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE
+"""Incremental rendering of the preview widgets between two revisions of a
+stylesheet, for when re-rendering every widget on every change is too slow.
+
+Only the rule sets of the two revisions are compared; any preview containing
+a widget that a changed selector can match is rendered again under both
+revisions and compared. Every other preview reuses the render cached for the
+old revision, and isn't even built.
+
+Everything is cached under a digest of what besides the stylesheet changes how
+the previews look: this package's version and preview code, the Qt and PySide2
+versions, the style, the platform plugin and the default font. In there, the
+classes used by each preview go into ``classes.json`` and the renders into a
+directory per digest of the stylesheet's text.
+
+Note:
+	Moving a rule around without changing it is not picked up as a change,
+	even though it can matter when two selectors have the same specificity.
+"""
+
+
+from . import __version__, RenderError
+from .qss import parse_stylesheet, changed_selectors, selector_type
+
+import PySide2
+from PySide2.QtWidgets import (
+	QApplication, QWidget, QLayout, QStatusBar, QMainWindow, QTabWidget,
+	QScrollArea, QFormLayout
+)
+from PySide2.QtGui import QImage
+from PySide2.QtCore import Qt, qVersion
+
+from collections import OrderedDict
+from hashlib import sha1
+from inspect import getsourcefile
+import json, os, re, shutil
+
+
+_preview = re.compile(r"^_init_(\w+)_preview$")
+
+_placements = {
+	"QStatusBar": "statusbar",
+	"QMenuBar": "menubar",
+	"QToolBar": "toolbar",
+	"QDockWidget": "dock",
+	"QTreeView": "tab",
+	"rich_text": "tab",
+}
+"""dict: Where `PySide2StyleTestWidget` puts each preview that isn't a row of
+its "Simple Elements" tab."""
+
+
+def _class_names(widget):
+	"""Every class name, including base classes, used by `widget` or any of
+	its children. Which is every type selector able to style them."""
+	names = set()
+	for each in [widget] + widget.findChildren(QWidget):
+		meta = each.metaObject()
+		while meta is not None:
+			names.add(meta.className())
+			meta = meta.superClass()
+
+	return names
+
+def _build(method, *args):
+	preview = method(*args)
+
+	# Some previews are layouts, which have to be put into a widget
+	# before they can be rendered.
+	if isinstance(preview, QLayout):
+		widget = QWidget()
+		widget.setLayout(preview)
+		preview = widget
+
+	return preview
+
+def preview_builders(window):
+	"""Find every preview the window knows how to build.
+
+	Args:
+		window (PySide2StyleTestWidget): The window whose ``_init_*_preview``
+			methods build the previews. It doesn't have to have a stylesheet.
+
+	Returns:
+		OrderedDict: The name of each preview mapped to a function that
+		builds a fresh, standalone copy of it.
+	"""
+	builders = OrderedDict()
+	for attr in sorted(dir(window)):
+		match = _preview.match(attr)
+		if match is not None:
+			builders[match.group(1)] = lambda method=getattr(window, attr): _build(method)
+
+	# The QMenuBar preview is the only one with a dependency, it reports its
+	# actions to a status bar. So it gets a spare one of its own.
+	if "QMenuBar" in builders:
+		builders["QMenuBar"] = lambda: _build(window._init_QMenuBar_preview, QStatusBar())
+
+	return builders
+
+def _host(name, preview):
+	"""Put `preview` where `PySide2StyleTestWidget` would, in a stand-in for
+	the window's own widgets. That way rules which depend on its ancestors,
+	like ``QScrollArea QPushButton``, style it the same as they would there.
+
+	Returns:
+		QMainWindow: The stand-in window, to apply the stylesheet to.
+	"""
+	window = QMainWindow()
+	tabs = QTabWidget()
+	window.setCentralWidget(tabs)
+
+	placement = _placements.get(name)
+	if placement == "statusbar":
+		window.setStatusBar(preview)
+	elif placement == "menubar":
+		window.setMenuBar(preview)
+	elif placement == "toolbar":
+		window.addToolBar(preview)
+	elif placement == "dock":
+		window.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, preview)
+	elif placement == "tab":
+		tabs.addTab(preview, name)
+	else:
+		content = QWidget()
+		QFormLayout(content).addRow(preview)
+		area = QScrollArea()
+		area.setWidget(content)
+		area.setWidgetResizable(True)
+		tabs.addTab(area, "Simple Elements")
+
+	return window
+
+def _render(window, preview, stylesheet):
+	window.setStyleSheet(stylesheet)
+	window.ensurePolished()
+	window.adjustSize()
+
+	# Images loaded back from the cache won't be in the same format as
+	# a fresh grab, so normalize them both before they're compared.
+	return preview.grab().toImage().convertToFormat(QImage.Format_ARGB32)
+
+def _save(image, path):
+	if not image.save(path):
+		raise RenderError(path, "Couldn't save render")
+
+def _environment(window):
+	"""Everything besides the stylesheet that has a say in how a render looks,
+	so renders made under anything else aren't mistaken for current ones."""
+	application = QApplication.instance()
+
+	# Any of our code the previews are built or rendered with.
+	paths = set([__file__])
+	for cls in type(window).__mro__:
+		try:
+			paths.add(getsourcefile(cls))
+		except (TypeError):
+			pass # Built in, so it's covered by the versions below.
+
+	source = sha1()
+	for path in sorted(each for each in paths if each):
+		with open(path, "rb") as code:
+			source.update(code.read())
+
+	return "\n".join([
+		__version__,
+		PySide2.__version__,
+		qVersion(),
+		QApplication.style().objectName(),
+		application.platformName(),
+		application.font().toString(),
+		source.hexdigest(),
+	])
+
+def _cache_dir(*parts):
+	"""Make and return the cache directory `parts` are hashed into, each
+	nested in the one for the part before it."""
+	path = parts[0]
+	for part in parts[1:]:
+		path = os.path.join(path, sha1(part.encode("utf-8")).hexdigest())
+	os.makedirs(path, exist_ok=True)
+
+	return path
+
+def _preview_classes(cache, builders):
+	"""The class names used by each preview, which only ever change along
+	with the environment so they're kept in `cache` rather than worked out
+	again on every run.
+
+	Returns:
+		tuple: The class names of each preview as a set, along with the
+		previews that had to be built to find them out, by name.
+	"""
+	path = os.path.join(cache, "classes.json")
+	try:
+		with open(path, "r") as stored:
+			classes = dict((k, set(v)) for k, v in json.load(stored).items())
+	except (OSError, ValueError):
+		classes = {}
+
+	built = {}
+	missing = [name for name in builders if name not in classes]
+	for name in missing:
+		built[name] = builders[name]()
+		classes[name] = _class_names(built[name])
+
+	if missing:
+		with open(path, "w") as stored:
+			json.dump(dict((k, sorted(v)) for k, v in classes.items()), stored,
+				indent="\t", sort_keys=True)
+
+	return classes, built
+
+def render_changed(window, old, new, cache):
+	"""Render the previews under the new revision of a stylesheet, only
+	doing the work for those its changes could affect.
+
+	Each preview is rendered in a stand-in for the spot it has in the
+	window, though previews built as layouts get an extra plain QWidget
+	around them to be rendered from.
+
+	Args:
+		window (PySide2StyleTestWidget): The window providing the previews.
+		old (str): The old revision of the stylesheet.
+		new (str): The new revision of the stylesheet.
+		cache (str): Directory renders are cached in between runs.
+
+	Returns:
+		list: A ``(name, status, path)`` tuple for every preview, where
+		`path` is its render under the new revision and `status` is one of:
+
+		 - ``"reused"``, unaffected and copied from the old revision's cache.
+		 - ``"rendered"``, unaffected but missing from the cache.
+		 - ``"changed"``, affected and looks different.
+		 - ``"unchanged"``, affected but looks exactly the same.
+
+	Raises:
+		RenderError: When a render can't be written to the cache.
+		OSError: When anything else in the cache can't be read or written.
+	"""
+	changed = changed_selectors(parse_stylesheet(old), parse_stylesheet(new))
+	types = set(selector_type(each) for each in changed)
+
+	builders = preview_builders(window)
+	environment = _cache_dir(cache, _environment(window))
+	classes, built = _preview_classes(environment, builders)
+	old_dir = _cache_dir(environment, old)
+	new_dir = _cache_dir(environment, new)
+
+	results = []
+	for name, build in builders.items():
+		old_path = os.path.join(old_dir, name + ".png")
+		new_path = os.path.join(new_dir, name + ".png")
+		# A selector without a type could match anything at all.
+		affected = None in types or bool(types & classes[name])
+
+		if not affected and os.path.exists(old_path):
+			if old_path != new_path:
+				shutil.copyfile(old_path, new_path)
+			results.append((name, "reused", new_path))
+			continue
+
+		preview = built.pop(name, None)
+		if preview is None:
+			preview = build()
+		host = _host(name, preview)
+
+		image = _render(host, preview, new)
+		_save(image, new_path)
+		if not affected:
+			results.append((name, "rendered", new_path))
+			continue
+
+		previous = QImage(old_path) if os.path.exists(old_path) else QImage()
+		if previous.isNull():
+			previous = _render(host, preview, old)
+			_save(previous, old_path)
+		else:
+			previous = previous.convertToFormat(QImage.Format_ARGB32)
+
+		status = "unchanged" if previous == image else "changed"
+		results.append((name, status, new_path))
+
+	return results
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2019 Ruby Allison Rose (aka: M3TIOR)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE
+"""Parsing and comparison of Qt stylesheets (QSS), just far enough to tell
+which rule sets changed between two revisions and which classes they style.
+
+Unlike the rest of the package this only needs the standard library, so its
+tests load it on its own and run even where PySide2 isn't installed.
+"""
+
+
+from collections import OrderedDict
+import re
+
+
+_token = re.compile(r"""/\*.*?(?:\*/|$)|"(?:\\.|[^"\\])*"?|'(?:\\.|[^'\\])*'?|.""", re.DOTALL)
+_subject = re.compile(r"^\.?([A-Za-z_][\w-]*)")
+
+
+def _tokenize(text):
+	"""Split `text` into quoted strings and single characters, leaving out
+	comments, so braces and such inside ``url("...")`` aren't mistaken for
+	the stylesheet's own."""
+	return [each for each in _token.findall(text) if not each.startswith("/*")]
+
+def _split(tokens, separator):
+	parts = [[]]
+	for token in tokens:
+		if token == separator:
+			parts.append([])
+		else:
+			parts[-1].append(token)
+
+	return parts
+
+def _join(tokens):
+	"""Put tokens back together, with any run of whitespace outside of a
+	quoted string collapsed into one space."""
+	joined = []
+	for token in tokens:
+		if not token.isspace():
+			joined.append(token)
+		elif joined and joined[-1] != " ":
+			joined.append(" ")
+
+	return "".join(joined).strip()
+
+def _declaration(tokens):
+	if ":" not in tokens:
+		return _join(tokens)
+
+	colon = tokens.index(":")
+	return "%s: %s" % (_join(tokens[:colon]), _join(tokens[colon + 1:]))
+
+def parse_stylesheet(text):
+	"""Break a stylesheet down into its rule sets.
+
+	Args:
+		text (str): The stylesheet's source.
+
+	Returns:
+		OrderedDict: Every selector mapped to the normalized declarations
+		applied to it. Selector lists are split up, and a selector used by
+		several rules gets all of their declarations in order.
+	"""
+	rules = OrderedDict()
+	selectors, body, inside = [], [], False
+	for token in _tokenize(text):
+		if not inside and token == "{":
+			inside = True
+		elif not inside and token == "}":
+			selectors = [] # Stray, Qt skips it too.
+		elif not inside:
+			selectors.append(token)
+		elif token != "}":
+			body.append(token)
+		else:
+			declarations = [
+				_declaration(each) for each in _split(body, ";") if _join(each)
+			]
+			for selector in _split(selectors, ","):
+				selector = _join(selector)
+				if selector:
+					rules.setdefault(selector, []).extend(declarations)
+
+			selectors, body, inside = [], [], False
+
+	return OrderedDict((k, "; ".join(v)) for k, v in rules.items())
+
+def changed_selectors(old, new):
+	"""Compare two parsed stylesheets.
+
+	Args:
+		old (dict): Rule sets of the old revision, from `parse_stylesheet`.
+		new (dict): Rule sets of the new revision, from `parse_stylesheet`.
+
+	Returns:
+		set: Every selector which was added, removed or had its
+		declarations changed.
+	"""
+	return set(
+		selector for selector in set(old) | set(new)
+		if old.get(selector) != new.get(selector)
+	)
+
+def selector_type(selector):
+	"""Find the class a selector applies its declarations to.
+
+	Args:
+		selector (str): A single selector, e.g. ``QGroupBox > QLabel:hover``.
+
+	Returns:
+		str: The Qt class name of the selector's subject, or None when it
+		could match a widget of any class, like ``*`` or ``#name`` do.
+	"""
+	# The subject is whatever follows the last combinator, not counting
+	# any inside an attribute selector like [text="a > b"].
+	tokens = _tokenize(selector.strip())
+	depth, start = 0, 0
+	for i, token in enumerate(tokens):
+		if token == "[":
+			depth += 1
+		elif token == "]":
+			depth -= 1
+		elif depth == 0 and (token == ">" or token.isspace()):
+			start = i + 1
+
+	match = _subject.match("".join(tokens[start:]))
+	if match is None:
+		return None
+
+	# QSS spells C++ namespaces with "--" since "::" means a subcontrol.
+	return match.group(1).replace("--", "::")
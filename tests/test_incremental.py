@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Tests for the incremental rendering behind --diff-against."""
+
+import argparse, contextlib, io, os, shutil, tempfile, unittest
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+	from PySide2.QtWidgets import QApplication, QWidget
+	from pyside2_style_test import PySide2StyleTestWidget, incremental
+	from pyside2_style_test.cli import _diff
+except (ImportError):
+	raise unittest.SkipTest("PySide2 is not installed")
+
+
+BASE = "QLabel { color: red; }\n"
+
+
+def setUpModule():
+	global application
+	application = QApplication.instance() or QApplication([])
+
+
+class CountingWidget(PySide2StyleTestWidget):
+	"""Counts how many times the most expensive preview gets built."""
+	tree_builds = 0
+
+	def _init_QTreeView_preview(self):
+		CountingWidget.tree_builds += 1
+		return PySide2StyleTestWidget._init_QTreeView_preview(self)
+
+
+class IncrementalTestCase(unittest.TestCase):
+
+	def setUp(self):
+		self.cache = tempfile.mkdtemp()
+		self.window = PySide2StyleTestWidget()
+
+	def tearDown(self):
+		shutil.rmtree(self.cache)
+
+	def run_changed(self, old, new, window=None):
+		results = incremental.render_changed(
+			window or self.window, old, new, self.cache)
+		return dict((name, status) for name, status, _ in results)
+
+
+class PreviewTest(IncrementalTestCase):
+
+	def test_builders_make_fresh_widgets(self):
+		builders = incremental.preview_builders(self.window)
+		for name in ("QScrollBar", "QMenuBar", "QPushButton", "QTreeView"):
+			self.assertIn(name, builders)
+
+		first = builders["QScrollBar"]()
+		self.assertIsInstance(first, QWidget)
+		self.assertIsNot(first, builders["QScrollBar"]())
+
+	def test_builders_leave_the_window_alone(self):
+		for build in incremental.preview_builders(self.window).values():
+			build()
+
+		self.assertFalse(hasattr(self.window, "_scroll_benchmark_area"))
+
+	def test_class_names(self):
+		builders = incremental.preview_builders(self.window)
+
+		names = incremental._class_names(builders["QScrollBar"]())
+		for name in ("QScrollBar", "QAbstractSlider", "QScrollArea", "QWidget"):
+			self.assertIn(name, names)
+
+		self.assertNotIn(
+			"QScrollBar", incremental._class_names(builders["QPushButton"]()))
+
+
+class RenderChangedTest(IncrementalTestCase):
+
+	def test_first_run_renders_everything(self):
+		statuses = self.run_changed(BASE, BASE)
+
+		self.assertEqual(set(statuses.values()), {"rendered"})
+		environment = os.listdir(self.cache)
+		self.assertEqual(len(environment), 1)
+		self.assertTrue(os.path.exists(
+			os.path.join(self.cache, environment[0], "classes.json")))
+
+	def test_identical_revision_reuses_everything(self):
+		self.run_changed(BASE, BASE)
+
+		self.assertEqual(set(self.run_changed(BASE, BASE).values()), {"reused"})
+
+	def test_scroll_bar_change_only_touches_scroll_bars(self):
+		self.run_changed(BASE, BASE)
+		statuses = self.run_changed(
+			BASE, BASE + "QScrollBar { background: green; }")
+
+		self.assertEqual(statuses["QScrollBar"], "changed")
+		self.assertIn(statuses["QListWidget"], ("changed", "unchanged"))
+		for name in ("QPushButton", "QCheckBox", "QMenuBar", "QStatusBar"):
+			self.assertEqual(statuses[name], "reused")
+
+	def test_unaffected_previews_are_not_built(self):
+		window = CountingWidget()
+		self.run_changed(BASE, BASE, window)
+		self.run_changed(BASE, BASE + "QPushButton { color: blue; }", window)
+
+		CountingWidget.tree_builds = 0
+		statuses = self.run_changed(
+			BASE, BASE + "QPushButton { color: green; }", window)
+
+		self.assertEqual(statuses["QTreeView"], "reused")
+		self.assertEqual(CountingWidget.tree_builds, 0)
+
+	def test_rules_on_ancestors_apply(self):
+		self.run_changed(BASE, BASE)
+		statuses = self.run_changed(
+			BASE, BASE + "QScrollArea QPushButton { background: red; }")
+
+		self.assertEqual(statuses["QPushButton"], "changed")
+
+	def test_untyped_selector_affects_everything(self):
+		self.run_changed(BASE, BASE)
+		statuses = self.run_changed(BASE, BASE + "#nothing { color: blue; }")
+
+		self.assertNotIn("reused", statuses.values())
+		self.assertNotIn("rendered", statuses.values())
+
+	def test_cache_is_keyed_on_environment(self):
+		self.run_changed(BASE, BASE)
+
+		with mock.patch.object(incremental, "_environment", return_value="other"):
+			statuses = self.run_changed(BASE, BASE)
+
+		self.assertEqual(set(statuses.values()), {"rendered"})
+		self.assertEqual(len(os.listdir(self.cache)), 2)
+
+
+class DiffTest(IncrementalTestCase):
+
+	def setUp(self):
+		IncrementalTestCase.setUp(self)
+		self.old = os.path.join(self.cache, "old.qss")
+		self.new = os.path.join(self.cache, "new.qss")
+		with open(self.old, "w") as old:
+			old.write(BASE)
+
+	def diff(self, new, test_widget=PySide2StyleTestWidget, cache=None):
+		with open(self.new, "w") as stylesheet:
+			stylesheet.write(new)
+
+		arguments = argparse.Namespace(
+			diff_against=self.old,
+			file=self.new,
+			render_cache=cache or os.path.join(self.cache, "renders"),
+		)
+		with contextlib.redirect_stdout(io.StringIO()), \
+			contextlib.redirect_stderr(io.StringIO()):
+			return _diff(test_widget, arguments)
+
+	def test_no_change(self):
+		self.assertEqual(self.diff(BASE), 0)
+
+	def test_changed_render(self):
+		self.assertEqual(self.diff(BASE + "QPushButton { color: blue; }"), 1)
+
+	def test_missing_stylesheet(self):
+		os.remove(self.old)
+		self.assertEqual(self.diff(BASE), 2)
+
+	def test_unwritable_cache(self):
+		self.assertEqual(self.diff(BASE, cache=self.old), 2)
+
+	def test_widget_needing_a_stylesheet(self):
+		self.assertEqual(self.diff(BASE, lambda stylesheet: None), 2)
+
+
+if __name__ == "__main__":
+	unittest.main()
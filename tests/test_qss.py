@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Tests for the stylesheet parsing and diffing behind --diff-against."""
+
+import importlib.util, os, unittest
+
+# Loaded straight from its file, since importing it through the package
+# would need PySide2 and this module doesn't.
+_spec = importlib.util.spec_from_file_location("qss", os.path.join(
+	os.path.dirname(__file__), os.pardir, "pyside2_style_test", "qss.py"))
+qss = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(qss)
+
+parse_stylesheet = qss.parse_stylesheet
+changed_selectors = qss.changed_selectors
+selector_type = qss.selector_type
+
+
+class ParseStylesheetTest(unittest.TestCase):
+
+	def test_splits_selector_lists(self):
+		rules = parse_stylesheet("QPushButton, QLabel { color: red; }")
+		self.assertEqual(list(rules.items()), [
+			("QPushButton", "color: red"),
+			("QLabel", "color: red"),
+		])
+
+	def test_normalizes_whitespace(self):
+		self.assertEqual(
+			parse_stylesheet("QLabel{color:blue}"),
+			parse_stylesheet("QLabel  {\n\tcolor :  blue ;\n}"),
+		)
+
+	def test_keeps_whitespace_in_strings(self):
+		rules = parse_stylesheet('QLabel { qproperty-text: "a  b"; }')
+		self.assertEqual(rules["QLabel"], 'qproperty-text: "a  b"')
+
+	def test_braces_in_strings(self):
+		rules = parse_stylesheet(
+			'QLabel { background: url("a{b}.png"); } QFrame { border: none; }')
+		self.assertEqual(list(rules.items()), [
+			("QLabel", 'background: url("a{b}.png")'),
+			("QFrame", "border: none"),
+		])
+
+	def test_ignores_comments(self):
+		rules = parse_stylesheet("/* QLabel { color: red; } */ QFrame { /* x */ }")
+		self.assertEqual(list(rules.items()), [("QFrame", "")])
+
+	def test_merges_repeated_selectors(self):
+		rules = parse_stylesheet("QLabel { color: red; } QLabel { margin: 0; }")
+		self.assertEqual(rules["QLabel"], "color: red; margin: 0")
+
+
+class ChangedSelectorsTest(unittest.TestCase):
+
+	def test_added_removed_and_modified(self):
+		old = parse_stylesheet("QLabel { color: red; } QFrame { border: none; }")
+		new = parse_stylesheet("QLabel { color: blue; } QSlider { margin: 0; }")
+		self.assertEqual(
+			changed_selectors(old, new), {"QLabel", "QFrame", "QSlider"})
+
+	def test_formatting_only_changes_nothing(self):
+		old = parse_stylesheet("QLabel { color: red; }")
+		new = parse_stylesheet("QLabel\n{\n\tcolor : red\n}\n")
+		self.assertEqual(changed_selectors(old, new), set())
+
+
+class SelectorTypeTest(unittest.TestCase):
+
+	def test_plain_and_pseudo(self):
+		self.assertEqual(selector_type("QPushButton"), "QPushButton")
+		self.assertEqual(
+			selector_type("QScrollBar::handle:horizontal"), "QScrollBar")
+
+	def test_subject_is_last_compound(self):
+		self.assertEqual(selector_type("QGroupBox > QLabel:hover"), "QLabel")
+		self.assertEqual(selector_type("QDialog QPushButton"), "QPushButton")
+
+	def test_attribute_with_combinator(self):
+		self.assertEqual(
+			selector_type('QPushButton[text="a > b"]'), "QPushButton")
+
+	def test_class_selector_and_namespace(self):
+		self.assertEqual(selector_type(".QLabel"), "QLabel")
+		self.assertEqual(selector_type("ns--MyWidget"), "ns::MyWidget")
+
+	def test_untyped(self):
+		self.assertIsNone(selector_type("*"))
+		self.assertIsNone(selector_type("#name"))
+		self.assertIsNone(selector_type("QGroupBox *"))
+
+
+if __name__ == "__main__":
+	unittest.main()
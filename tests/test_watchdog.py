@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Tests for the event loop stall watchdog behind --watchdog."""
+
+import os, tempfile, time, unittest
+
+try:
+	from pyside2_style_test import _StallWatchdog
+except (ImportError):
+	raise unittest.SkipTest("PySide2 is not installed")
+
+
+class StallWatchdogTest(unittest.TestCase):
+
+	def setUp(self):
+		handle, self.log = tempfile.mkstemp()
+		os.close(handle)
+		self.watchdog = _StallWatchdog(0.02, 0.05, self.log)
+		self.watchdog.start()
+
+	def tearDown(self):
+		self.watchdog.stop()
+		os.remove(self.log)
+
+	def stall(self):
+		time.sleep(0.3)
+		return self.watchdog.beat()
+
+	def test_regular_beats_are_not_stalls(self):
+		for _ in range(20):
+			time.sleep(0.01)
+			self.assertIsNone(self.watchdog.beat())
+
+		self.assertEqual(self.watchdog.stalls, [])
+		self.assertEqual(self.watchdog.summary(), "No event loop stalls recorded")
+
+	def test_late_beat_is_a_stall(self):
+		self.watchdog.begin("stylesheet reload")
+		stall = self.stall()
+
+		self.assertEqual(stall["activity"], "stylesheet reload")
+		self.assertGreater(stall["duration"], 0.05)
+		self.assertIn("in stall", stall["stack"])
+		self.assertEqual(self.watchdog.stalls, [stall])
+
+	def test_beat_keeps_activity_until_it_ends(self):
+		token = self.watchdog.begin("stylesheet reload")
+		self.assertIsNone(self.watchdog.beat())
+		self.assertEqual(self.stall()["activity"], "stylesheet reload")
+
+		self.watchdog.end(token)
+		self.assertEqual(self.stall()["activity"], "idle")
+
+	def test_end_ignores_stale_tokens(self):
+		stale = self.watchdog.begin("stylesheet reload")
+		self.watchdog.begin("mouse press on QPushButton")
+		self.watchdog.end(stale)
+
+		self.assertEqual(self.stall()["activity"], "mouse press on QPushButton")
+
+	def test_summary(self):
+		self.watchdog.begin("stylesheet reload")
+		self.stall()
+		self.stall()
+
+		summary = self.watchdog.summary()
+		self.assertTrue(summary.startswith("2 event loop stall(s), "))
+		self.assertIn("during stylesheet reload", summary)
+
+	def test_stop_writes_log(self):
+		self.watchdog.begin("stylesheet reload")
+		self.stall()
+		self.watchdog.stop()
+
+		with open(self.log) as log:
+			text = log.read()
+		self.assertIn("stall detected during stylesheet reload:\n", text)
+		self.assertIn("in stall", text)
+		self.assertIn("stall ended after ", text)
+		self.assertTrue(text.endswith(self.watchdog.summary() + "\n"))
+
+
+if __name__ == "__main__":
+	unittest.main()